@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
 
+from wapp_core import (
+    load_data, preaggregate, get_filter_options, strategic_pipeline, net_wapp_total,
+    cap_rows, session_figure, build_industry_bar, build_funnel_bar, build_ramp_line
+)
+
 st.set_page_config(
     page_title="monday.com CRO Revenue Command Center",
     layout="wide"
@@ -12,50 +16,40 @@ st.set_page_config(
 # LOAD DATA
 # ==========================================================
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv("wapp_data.csv")
-
-    df["WEEKLY_REVISED"] = pd.to_datetime(df["WEEKLY_REVISED"], errors="coerce")
-
-    numeric_cols = ["WAPP_NEW", "WAPP_RESURRECT", "WAPP_CHURN", "WAPP"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    df["INDUSTRY"] = df["INDUSTRY"].astype(str).replace("nan", "Unknown")
-    df["REGION"] = df["REGION"].fillna("NA").replace("nan", "NA").astype(str)
-
-    df["NET_WAPP"] = df["WAPP_NEW"] + df["WAPP_RESURRECT"] - df["WAPP_CHURN"]
-
-    return df
-
 df = load_data()
+pre = preaggregate(df)
 
 # ==========================================================
 # SIDEBAR FILTERS
 # ==========================================================
 
-st.sidebar.header("Strategic Filters")
+min_date, max_date, industries, regions = get_filter_options(df)
+
+# One form for every sidebar control: edits are batched into a single rerun on Apply
+with st.sidebar.form("controls"):
+    st.header("Strategic Filters")
+
+    date_range = st.date_input("Date Range", value=(min_date, max_date))
 
-min_date = df["WEEKLY_REVISED"].min()
-max_date = df["WEEKLY_REVISED"].max()
+    selected_industries = st.multiselect("Industries", industries, default=industries)
+    selected_regions = st.multiselect("Regions", regions, default=regions)
 
-date_range = st.sidebar.date_input("Date Range", value=(min_date, max_date))
+    st.header("Hiring Controls")
 
-industries = sorted(df["INDUSTRY"].unique())
-regions = sorted(df["REGION"].unique())
+    role = st.selectbox("Role Type", ["Account Executives", "SDRs", "CSMs"])
+    quarter_goal = st.number_input("Quarter Hiring Goal", min_value=1, value=20)
+    current_headcount = st.number_input("Current Active Headcount", min_value=0, value=15)
+    pipeline_count = st.number_input("Candidates in Pipeline", min_value=0, value=8)
+    quota_attainment = st.slider("Quota Attainment %", 50, 100, 70)
+    ramp_months = st.slider("Ramp Time (months)", 3, 9, 6)
 
-selected_industries = st.sidebar.multiselect("Industries", industries, default=industries)
-selected_regions = st.sidebar.multiselect("Regions", regions, default=regions)
+    st.form_submit_button("Apply")
 
-df_filtered = df[
-    (df["WEEKLY_REVISED"] >= pd.Timestamp(date_range[0])) &
-    (df["WEEKLY_REVISED"] <= pd.Timestamp(date_range[1])) &
-    (df["INDUSTRY"].isin(selected_industries)) &
-    (df["REGION"].isin(selected_regions))
-]
+pipeline = strategic_pipeline(
+    pre, date_range[0], date_range[1], selected_industries, selected_regions
+)
 
-if df_filtered.empty:
+if pipeline is None:
     st.warning("No data for selected filters.")
     st.stop()
 
@@ -69,12 +63,13 @@ st.title("📊 CRO Strategic + Tactical Revenue Command Center")
 # STRATEGIC WAPP SUMMARY
 # ==========================================================
 
-col1, col2, col3, col4 = st.columns(4)
+industry_summary = pipeline["industry_summary"]
+totals = pipeline["totals"]
+total_net, total_new, total_res, total_churn = (
+    totals["Net"], totals["New"], totals["Resurrect"], totals["Churn"]
+)
 
-total_net = df_filtered["NET_WAPP"].sum()
-total_new = df_filtered["WAPP_NEW"].sum()
-total_res = df_filtered["WAPP_RESURRECT"].sum()
-total_churn = df_filtered["WAPP_CHURN"].sum()
+col1, col2, col3, col4 = st.columns(4)
 
 col1.metric("Net WAPP", f"{int(total_net):,}")
 col2.metric("New WAPP", f"{int(total_new):,}")
@@ -87,13 +82,6 @@ st.markdown("---")
 # INDUSTRY BREAKDOWN
 # ==========================================================
 
-industry_summary = df_filtered.groupby("INDUSTRY").agg(
-    New=("WAPP_NEW","sum"),
-    Resurrect=("WAPP_RESURRECT","sum"),
-    Churn=("WAPP_CHURN","sum"),
-    Net=("NET_WAPP","sum")
-).reset_index()
-
 # Add dynamic sorting
 sort_metric = st.selectbox(
     "Sort Industries By",
@@ -106,12 +94,8 @@ industry_sorted = industry_summary.sort_values(
     ascending=False
 )
 
-fig_industry = px.bar(
-    industry_sorted.head(10),
-    x="INDUSTRY",
-    y=["New","Resurrect","Churn","Net"],  # <-- Net added here
-    barmode="group",
-    title="Top Industries — WAPP Breakdown"
+fig_industry = session_figure(
+    "fig_industry", industry_sorted.head(10), "INDUSTRY", build_industry_bar
 )
 
 st.plotly_chart(fig_industry, use_container_width=True)
@@ -124,60 +108,19 @@ st.markdown("---")
 
 st.header("🧠 Industry Prioritization Engine")
 
-industry_diag = industry_summary.copy()
-
-industry_diag["WER"] = (
-    (industry_diag["New"] + industry_diag["Resurrect"]) /
-    industry_diag["Churn"].replace(0, np.nan)
-)
-
-industry_diag["Resurrection_Dependency"] = (
-    industry_diag["Resurrect"] /
-    (industry_diag["New"] + industry_diag["Resurrect"]).replace(0, np.nan)
-)
-
-industry_diag["New_to_Churn_Ratio"] = (
-    industry_diag["New"] /
-    industry_diag["Churn"].replace(0, np.nan)
-)
-
-weeks_in_period = max(
-    1,
-    (df_filtered["WEEKLY_REVISED"].max() - df_filtered["WEEKLY_REVISED"].min()).days / 7
-)
+industry_diag = pipeline["industry_diag"]
 
-industry_diag["Churn_Velocity"] = industry_diag["Churn"] / weeks_in_period
-
-industry_diag = industry_diag.replace([np.inf, -np.inf], np.nan).fillna(0)
-
-def classify(row):
-    if row["WER"] < 1 and row["Churn_Velocity"] > industry_diag["Churn_Velocity"].median():
-        return "🔴 Fix Churn"
-    elif row["WER"] > 1.2 and row["Resurrection_Dependency"] < 0.4:
-        return "🟢 Accelerate AE Hiring"
-    elif row["Resurrection_Dependency"] > 0.7:
-        return "🟡 Fragile Growth"
-    elif row["New_to_Churn_Ratio"] > 1.5:
-        return "🟢 SDR Expansion"
-    else:
-        return "⚪ Monitor"
-
-industry_diag["Strategic_Action"] = industry_diag.apply(classify, axis=1)
-industry_diag["Opportunity_Score"] = (industry_diag["Net"] * industry_diag["WER"]).abs()
-
-st.dataframe(industry_diag.round(2), use_container_width=True)
-
-fig_auto = px.scatter(
-    industry_diag,
-    x="Churn_Velocity",
-    y="WER",
-    size="Opportunity_Score",
-    color="Strategic_Action",
-    hover_name="INDUSTRY",
-    size_max=60
+# Two-decimal display is a column format, so the frame itself is not copied to round it
+st.dataframe(
+    cap_rows(industry_diag, "Opportunity_Score", "INDUSTRY", ["New", "Resurrect", "Churn", "Net"]),
+    column_config={
+        col: st.column_config.NumberColumn(format="%.2f")
+        for col in ["WER", "Resurrection_Dependency", "New_to_Churn_Ratio", "Churn_Velocity", "Opportunity_Score"]
+    },
+    use_container_width=True
 )
 
-fig_auto.add_hline(y=1, line_dash="dash")
+fig_auto = pipeline["fig_scatter"]
 st.plotly_chart(fig_auto, use_container_width=True)
 
 # ==========================================================
@@ -203,21 +146,12 @@ st.markdown("---")
 
 st.header("🎯 Sales Hiring → Revenue Impact (Data Driven)")
 
-st.sidebar.header("Hiring Controls")
-
-role = st.sidebar.selectbox("Role Type", ["Account Executives", "SDRs", "CSMs"])
-quarter_goal = st.sidebar.number_input("Quarter Hiring Goal", min_value=1, value=20)
-current_headcount = st.sidebar.number_input("Current Active Headcount", min_value=0, value=15)
-pipeline_count = st.sidebar.number_input("Candidates in Pipeline", min_value=0, value=8)
-quota_attainment = st.sidebar.slider("Quota Attainment %", 50, 100, 70)
-ramp_months = st.sidebar.slider("Ramp Time (months)", 3, 9, 6)
-
 BASE_AE_QUOTA = 750000
 ROLE_MULTIPLIER = {"Account Executives":1.0,"SDRs":0.25,"CSMs":0.4}
 
 arr_quota = BASE_AE_QUOTA * ROLE_MULTIPLIER[role]
 
-growth_scaler = max(0.1, total_net / max(1, df["NET_WAPP"].sum()))
+growth_scaler = max(0.1, total_net / max(1, net_wapp_total(df)))
 scaled_quota = arr_quota * growth_scaler
 
 ramp_factor = min(1.0, ramp_months / 6)
@@ -254,7 +188,7 @@ for r in drop_rates:
 
 funnel_df=pd.DataFrame({"Stage":stage_names,"Candidates":counts})
 
-fig_funnel=px.bar(funnel_df,x="Stage",y="Candidates",title=f"{role} Funnel")
+fig_funnel=build_funnel_bar(funnel_df,role)
 st.plotly_chart(fig_funnel,use_container_width=True)
 
 st.markdown("---")
@@ -271,7 +205,7 @@ actual=target*(quota_attainment/100)
 
 ramp_df=pd.DataFrame({"Month":months,"Target Ramp %":target,"Actual Ramp %":actual})
 
-fig_ramp=px.line(ramp_df,x="Month",y=["Target Ramp %","Actual Ramp %"],markers=True)
+fig_ramp=session_figure("fig_ramp",ramp_df,"Month",build_ramp_line)
 st.plotly_chart(fig_ramp,use_container_width=True)
 
 st.markdown("---")
@@ -0,0 +1,303 @@
+import os
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import numpy as np
+
+# ==========================================================
+# LOAD DATA
+# ==========================================================
+
+CSV_PATH = "wapp_data.csv"
+PARQUET_PATH = "wapp_data.parquet"
+
+DATA_COLS = [
+    "WEEKLY_REVISED", "INDUSTRY", "REGION",
+    "WAPP_NEW", "WAPP_RESURRECT", "WAPP_CHURN"
+]
+
+SUMMARY_COLS = {
+    "WAPP_NEW": "New",
+    "WAPP_RESURRECT": "Resurrect",
+    "WAPP_CHURN": "Churn"
+}
+
+CSV_DTYPES = {
+    "INDUSTRY": "category",
+    "REGION": "category",
+    "WAPP_NEW": "str",
+    "WAPP_RESURRECT": "str",
+    "WAPP_CHURN": "str"
+}
+
+def _fill_category(col, label):
+    # Missing values get their own label, added only when something is missing so
+    # the filter options never list a value no row has; categories are kept sorted
+    # so groupby output stays in the same alphabetical order plain strings would give
+    if col.isna().any():
+        if label not in col.cat.categories:
+            col = col.cat.add_categories([label])
+        col = col.fillna(label)
+    return col.cat.reorder_categories(sorted(col.cat.categories))
+
+def _parquet_is_fresh():
+    # The typed Parquet copy is rebuilt only when the CSV (or this cleaning code) is newer
+    return (
+        os.path.exists(PARQUET_PATH)
+        and os.path.getmtime(PARQUET_PATH) >= max(
+            os.path.getmtime(CSV_PATH), os.path.getmtime(__file__)
+        )
+    )
+
+def _read_csv():
+    df = pd.read_csv(
+        CSV_PATH,
+        usecols=DATA_COLS,
+        dtype=CSV_DTYPES,
+        engine="c"
+    )
+
+    # Explicit format keeps parsing on the vectorized path instead of inferring per value
+    df["WEEKLY_REVISED"] = pd.to_datetime(df["WEEKLY_REVISED"], format="%m/%d/%Y", errors="coerce")
+
+    # Counts arrive as text: large ones are quoted with thousands separators
+    # ("4,241"), and anything still non-numeric (e.g. "-") counts as 0
+    numeric_cols = ["WAPP_NEW", "WAPP_RESURRECT", "WAPP_CHURN"]
+    counts = pd.DataFrame({
+        col: pd.to_numeric(df[col].str.replace(",", "", regex=False), errors="coerce")
+        for col in numeric_cols
+    }).fillna(0)
+    # to_numeric gives int64/float64, both exact at these sizes, so out-of-range
+    # counts are still visible here, before the int32 cast would wrap them
+    int32 = np.iinfo("int32")
+    if ((counts < int32.min) | (counts > int32.max)).any(axis=None):
+        raise ValueError("WAPP counts exceed the int32 range used for storage")
+    # The cast would silently truncate fractional counts, so refuse them instead
+    if (counts % 1 != 0).any(axis=None):
+        raise ValueError("WAPP counts must be whole numbers to be stored as int32")
+    df[numeric_cols] = counts.astype("int32")
+
+    df["INDUSTRY"] = _fill_category(df["INDUSTRY"], "Unknown")
+    df["REGION"] = _fill_category(df["REGION"], "NA")
+
+    # Stored in week order so date filters can binary-search instead of scanning
+    df = df.sort_values("WEEKLY_REVISED", kind="stable").reset_index(drop=True)
+    return df[DATA_COLS]
+
+def _write_parquet(df):
+    # Written beside the target and renamed over it, so a killed process never
+    # leaves a truncated file with a fresh mtime. A read-only checkout just
+    # goes without the cache file and parses the CSV on each start.
+    tmp_path = f"{PARQUET_PATH}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+        os.replace(tmp_path, PARQUET_PATH)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# The master frames are shared read-only singletons: cache_resource hands back
+# the same object on every rerun instead of hashing and copying it, and the
+# underscore args below tell Streamlit not to hash the frame passed in either.
+
+@st.cache_resource
+def load_data():
+    if _parquet_is_fresh():
+        return pd.read_parquet(PARQUET_PATH, engine="pyarrow", columns=DATA_COLS)
+    df = _read_csv()
+    _write_parquet(df)
+    return df
+
+@st.cache_resource
+def preaggregate(_df):
+    # Week x industry x region sums; every view re-aggregates this cube.
+    # groupby sorts its keys, so the cube stays in week order like df.
+    return _df.groupby(["WEEKLY_REVISED", "INDUSTRY", "REGION"], observed=True)[
+        list(SUMMARY_COLS)
+    ].sum().reset_index()
+
+# ==========================================================
+# FILTERS + AGGREGATIONS
+# ==========================================================
+
+@st.cache_data
+def get_filter_options(_df):
+    # Categories are already unique, so this sorts a few labels, not every row
+    return (
+        _df["WEEKLY_REVISED"].min(),
+        _df["WEEKLY_REVISED"].max(),
+        sorted(_df["INDUSTRY"].cat.categories.tolist()),
+        sorted(_df["REGION"].cat.categories.tolist())
+    )
+
+def _isin_codes(col, values):
+    # Membership test on the category's int codes instead of hashing strings
+    codes = col.cat.categories.get_indexer(values)
+    return np.isin(col.cat.codes.to_numpy(), codes[codes >= 0])
+
+def apply_filters(df, start, end, industries, regions):
+    # df is sorted by WEEKLY_REVISED, so the date range is one contiguous slice
+    weeks = df["WEEKLY_REVISED"].to_numpy()
+    i0 = np.searchsorted(weeks, np.datetime64(start, "ns"), side="left")
+    i1 = np.searchsorted(weeks, np.datetime64(end, "ns"), side="right")
+    df = df.iloc[i0:i1]
+
+    mask = None
+    for col, selected in (("INDUSTRY", industries), ("REGION", regions)):
+        # Selecting every category (the default) keeps all rows, so skip the scan
+        if not set(df[col].cat.categories).issubset(selected):
+            col_mask = _isin_codes(df[col], selected)
+            mask = col_mask if mask is None else mask & col_mask
+
+    return df if mask is None else df[mask]
+
+@st.cache_data
+def net_wapp_total(_df):
+    new, res, churn = _df[list(SUMMARY_COLS)].to_numpy().sum(axis=0)
+    return int(new + res - churn)
+
+def industry_agg(df):
+    # One hash-aggregation pass over all measures instead of one per named agg.
+    # Groups stay in appearance order: every consumer re-sorts the summary
+    # (by the chosen metric or by Opportunity_Score), so a key sort here is wasted.
+    summary = (
+        df.groupby("INDUSTRY", sort=False, observed=True)[list(SUMMARY_COLS)]
+        .sum()
+        .rename(columns=SUMMARY_COLS)
+        .reset_index()
+    )
+    # Net is derived per group rather than stored as a column on every row
+    summary["Net"] = summary["New"] + summary["Resurrect"] - summary["Churn"]
+    return summary
+
+# ==========================================================
+# INDUSTRY DIAGNOSTICS
+# ==========================================================
+
+def _safe_ratio(num, den):
+    # Zero denominators give 0.0 in the same pass, so no inf/NaN cleanup afterwards
+    out = np.zeros(len(num), dtype="float64")
+    return np.divide(num, den, out=out, where=den != 0)
+
+def compute_industry_diag(industry_summary, weeks_in_period):
+    industry_diag = industry_summary.copy()
+
+    new = industry_diag["New"].to_numpy()
+    res = industry_diag["Resurrect"].to_numpy()
+    churn = industry_diag["Churn"].to_numpy()
+
+    industry_diag["WER"] = _safe_ratio(new + res, churn)
+    industry_diag["Resurrection_Dependency"] = _safe_ratio(res, new + res)
+    industry_diag["New_to_Churn_Ratio"] = _safe_ratio(new, churn)
+
+    industry_diag["Churn_Velocity"] = industry_diag["Churn"] / weeks_in_period
+
+    # np.select takes the first condition that matches, so list order is precedence
+    churn_velocity_median = industry_diag["Churn_Velocity"].median()
+    conditions = [
+        (industry_diag["WER"] < 1) & (industry_diag["Churn_Velocity"] > churn_velocity_median),
+        (industry_diag["WER"] > 1.2) & (industry_diag["Resurrection_Dependency"] < 0.4),
+        industry_diag["Resurrection_Dependency"] > 0.7,
+        industry_diag["New_to_Churn_Ratio"] > 1.5
+    ]
+    actions = [
+        "🔴 Fix Churn",
+        "🟢 Accelerate AE Hiring",
+        "🟡 Fragile Growth",
+        "🟢 SDR Expansion"
+    ]
+
+    industry_diag["Strategic_Action"] = np.select(conditions, actions, default="⚪ Monitor")
+    industry_diag["Opportunity_Score"] = (industry_diag["Net"] * industry_diag["WER"]).abs()
+
+    # Sorted once here (cached) so the table, scatter and alerts all reuse this order
+    return industry_diag.sort_values("Opportunity_Score", ascending=False, ignore_index=True)
+
+# ==========================================================
+# CHARTS + TABLES
+# ==========================================================
+
+MAX_TABLE_ROWS = 50
+
+def cap_rows(frame, by, label_col, sum_cols, n=MAX_TABLE_ROWS):
+    # Send at most n rows to the browser; the long tail is summed into "Other"
+    if len(frame) <= n:
+        return frame
+    ranked = frame.sort_values(by, ascending=False)
+    other = {label_col: "Other", **ranked.iloc[n:][sum_cols].sum()}
+    return pd.concat([ranked.head(n), pd.DataFrame([other])], ignore_index=True)
+
+def session_figure(key, frame, x, build):
+    # Build a wide-form figure once per session, then only swap trace data on
+    # reruns. session_state (not a shared cache) keeps sessions from mutating
+    # each other's figure; px names each trace after its y column.
+    fig = st.session_state.get(key)
+    if fig is None:
+        fig = build(frame)
+        st.session_state[key] = fig
+    else:
+        with fig.batch_update():
+            for trace in fig.data:
+                trace.x = frame[x]
+                trace.y = frame[trace.name]
+    return fig
+
+def build_industry_bar(frame):
+    return px.bar(
+        frame,
+        x="INDUSTRY",
+        y=["New","Resurrect","Churn","Net"],  # <-- Net added here
+        barmode="group",
+        title="Top Industries — WAPP Breakdown"
+    )
+
+def build_scatter(industry_diag):
+    fig = px.scatter(
+        industry_diag,
+        x="Churn_Velocity",
+        y="WER",
+        size="Opportunity_Score",
+        color="Strategic_Action",
+        hover_name="INDUSTRY",
+        size_max=60
+    )
+    fig.add_hline(y=1, line_dash="dash")
+    return fig
+
+def build_funnel_bar(funnel_df, role):
+    return px.bar(funnel_df,x="Stage",y="Candidates",title=f"{role} Funnel")
+
+def build_ramp_line(frame):
+    return px.line(frame,x="Month",y=["Target Ramp %","Actual Ramp %"],markers=True)
+
+# ==========================================================
+# STRATEGIC PIPELINE
+# ==========================================================
+
+# The only cache in this section: it is keyed on the filter widgets alone,
+# and the helpers it calls are plain functions, so nothing below hashes or
+# stores an intermediate frame. Each entry holds one filter combination's
+# results; max_entries keeps a long-running server from growing without bound.
+
+@st.cache_data(max_entries=32)
+def strategic_pipeline(_pre, start, end, industries, regions):
+    filtered = apply_filters(_pre, start, end, industries, regions)
+    if filtered.empty:
+        return None
+
+    weeks = filtered["WEEKLY_REVISED"]
+    weeks_in_period = max(1, (weeks.max() - weeks.min()).days / 7)
+
+    industry_summary = industry_agg(filtered)
+    industry_diag = compute_industry_diag(industry_summary, weeks_in_period)
+
+    # Totals from the per-industry sums: one reduction over G rows, not the filtered frame
+    new, res, churn = industry_summary[["New", "Resurrect", "Churn"]].to_numpy().sum(axis=0)
+
+    return {
+        "totals": {"New": new, "Resurrect": res, "Churn": churn, "Net": new + res - churn},
+        "industry_summary": industry_summary,
+        "industry_diag": industry_diag,
+        "fig_scatter": build_scatter(industry_diag)
+    }